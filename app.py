@@ -1,6 +1,16 @@
+import contextlib
+import hashlib
+import hmac
+import json
 import os
+import queue
+import shutil
 import sqlite3
-from typing import Optional, Dict, Any, List
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Tuple
 
 from flask import (
     Flask,
@@ -11,8 +21,13 @@ from flask import (
     session,
     flash,
     abort,
+    g,
+    get_flashed_messages,
+    jsonify,
+    stream_template,
 )
 
+from werkzeug.local import LocalProxy
 from werkzeug.security import generate_password_hash, check_password_hash
 from werkzeug.utils import secure_filename
 
@@ -22,20 +37,25 @@ DB_PATH = os.path.join(BASE_DIR, "petrescue.db")
 UPLOAD_FOLDER = os.path.join(BASE_DIR, "static", "uploads")
 ALLOWED_EXTENSIONS = {"png", "jpg", "jpeg", "webp"}
 
+# werkzeug hash method for new passwords, e.g. "scrypt:16384:8:1" or
+# "pbkdf2:sha256:200000"; existing hashes keep verifying with their own method
+PASSWORD_HASH_METHOD = os.environ.get("PASSWORD_HASH_METHOD", "scrypt")
+
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
 app = Flask(__name__)
 app.secret_key = os.environ.get("SECRET_KEY", "dev-secret-key")
 app.config["UPLOAD_FOLDER"] = UPLOAD_FOLDER
+app.config["MAX_CONTENT_LENGTH"] = 8 * 1024 * 1024  # 8 MB per request
 
 
 @app.context_processor
 def inject_globals():
-    # Available in all templates
+    # Available in all templates; resolved only if a template actually uses them
     return {
-        "current_user": current_user(),
-        "current_admin": current_admin(),
-        "current_shelter": current_shelter(),
+        "current_user": LocalProxy(current_user),
+        "current_admin": LocalProxy(current_admin),
+        "current_shelter": LocalProxy(current_shelter),
     }
 
 
@@ -43,28 +63,199 @@ def inject_globals():
 # DB helpers
 # -----------------------
 
-def get_db() -> sqlite3.Connection:
-    conn = sqlite3.connect(DB_PATH)
+_DB_POOL_SIZE = 8
+
+# Idle connections, most recently used first so warm caches get reused
+_db_pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue(maxsize=_DB_POOL_SIZE)
+_wal_checked = False
+
+
+def _connect() -> sqlite3.Connection:
+    global _wal_checked
+    # timeout = SQLite busy_timeout: wait up to 5 s for a lock instead of failing
+    conn = sqlite3.connect(
+        DB_PATH,
+        timeout=5.0,
+        check_same_thread=False,
+        isolation_level=None,
+        cached_statements=128,  # prepared statements kept per (pooled) connection
+    )
     conn.row_factory = sqlite3.Row
+    if not _wal_checked and DB_PATH != ":memory:":
+        # journal_mode is stored in the database file, so switch it only once.
+        # WAL lets readers run while a write is in progress; it needs write
+        # access to the database directory, so keep the default journal if not
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+        except sqlite3.OperationalError:
+            pass
+        _wal_checked = True
+    # foreign_keys is per connection and off by default; it makes deleting a
+    # user or shelter cascade to their donations / animals inside SQLite
+    conn.executescript("""
+        PRAGMA foreign_keys=ON;
+        PRAGMA synchronous=NORMAL;
+        PRAGMA temp_store=MEMORY;
+        PRAGMA mmap_size=134217728;
+        PRAGMA cache_size=-20000;
+    """)
     return conn
 
 
-def _table_has_column(conn: sqlite3.Connection, table: str, col: str) -> bool:
+def get_db() -> sqlite3.Connection:
+    # One connection per request, borrowed from the pool and handed back in
+    # _release_db(); callers must not close it.
+    if "db" not in g:
+        try:
+            g.db = _db_pool.get_nowait()
+        except queue.Empty:
+            g.db = _connect()
+    return g.db
+
+
+@app.teardown_appcontext
+def _release_db(exc: Optional[BaseException]) -> None:
+    conn = g.pop("db", None)
+    if conn is None:
+        return
+    if conn.in_transaction:
+        conn.rollback()
+    try:
+        _db_pool.put_nowait(conn)
+    except queue.Full:
+        conn.close()
+
+
+# Columns added after the tables were first created (safe migrations)
+_MIGRATIONS: Dict[str, List[Tuple[str, str]]] = {
+    "users": [
+        ("avatar_url", "TEXT NOT NULL DEFAULT ''"),
+    ],
+    "admins": [
+        ("must_reset_password", "INTEGER NOT NULL DEFAULT 1"),
+    ],
+    "shelters": [
+        ("photo_filename", "TEXT NOT NULL DEFAULT ''"),
+        ("password_hash", "TEXT NOT NULL DEFAULT ''"),
+        ("shelter_type", "TEXT NOT NULL DEFAULT 'General'"),
+        ("urgent_level", "INTEGER NOT NULL DEFAULT 0"),
+        ("pickup_service", "INTEGER NOT NULL DEFAULT 1"),
+    ],
+    "shelter_requests": [
+        ("photo_filename", "TEXT NOT NULL DEFAULT ''"),
+        ("password_hash", "TEXT NOT NULL DEFAULT ''"),
+        ("shelter_type", "TEXT NOT NULL DEFAULT 'General'"),
+        ("pickup_service", "INTEGER NOT NULL DEFAULT 1"),
+    ],
+}
+
+
+def _table_columns(conn: sqlite3.Connection, table: str) -> set:
+    return {r["name"] for r in conn.execute(f"PRAGMA table_info({table})")}
+
+
+def _ensure_columns(conn: sqlite3.Connection, table: str, columns: List[Tuple[str, str]]) -> None:
+    # One PRAGMA per table, then ALTER only what is missing
+    existing = _table_columns(conn, table)
     cur = conn.cursor()
-    cur.execute(f"PRAGMA table_info({table})")
-    cols = [r["name"] for r in cur.fetchall()]
-    return col in cols
+    for col, col_def in columns:
+        if col not in existing:
+            cur.execute(f"ALTER TABLE {table} ADD COLUMN {col} {col_def}")
+
+
+@contextlib.contextmanager
+def db_transaction(conn: sqlite3.Connection):
+    # BEGIN IMMEDIATE takes the write lock up front, so the statements inside
+    # cannot be interleaved with another writer; one commit, or roll back
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        if conn.in_transaction:
+            conn.rollback()
+        raise
+    conn.commit()
 
 
-def _ensure_column(conn: sqlite3.Connection, table: str, col: str, col_def: str) -> None:
-    if not _table_has_column(conn, table, col):
-        cur = conn.cursor()
-        cur.execute(f"ALTER TABLE {table} ADD COLUMN {col} {col_def}")
-        conn.commit()
+# Child tables whose rows go away with their parent (ON DELETE CASCADE)
+_CASCADE_TABLES: Dict[str, str] = {
+    # Donations / volunteer intents
+    "donations": """
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            category TEXT NOT NULL,
+            shelter_id INTEGER NOT NULL,
+            amount REAL NOT NULL DEFAULT 0,
+            details TEXT NOT NULL DEFAULT '',
+            message TEXT NOT NULL DEFAULT '',
+            created_at TEXT NOT NULL DEFAULT (datetime('now')),
+            FOREIGN KEY(user_id) REFERENCES users(id) ON DELETE CASCADE,
+            FOREIGN KEY(shelter_id) REFERENCES shelters(id) ON DELETE CASCADE
+    """,
+    # Animals (uploaded by shelters)
+    "animals": """
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            shelter_id INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            species TEXT NOT NULL DEFAULT '',
+            age TEXT NOT NULL DEFAULT '',
+            story TEXT NOT NULL DEFAULT '',
+            photo_filename TEXT NOT NULL DEFAULT '',
+            created_at TEXT NOT NULL DEFAULT (datetime('now')),
+            FOREIGN KEY(shelter_id) REFERENCES shelters(id) ON DELETE CASCADE
+    """,
+}
+
+
+def _ensure_cascade(conn: sqlite3.Connection, table: str, columns_sql: str) -> None:
+    # Databases created before ON DELETE CASCADE have the foreign keys without
+    # it (or none at all). SQLite cannot ALTER a constraint, so rebuild the
+    # table: the caller must have foreign_keys OFF while this runs.
+    cur = conn.cursor()
+    cur.execute(f"PRAGMA foreign_key_list({table})")
+    fks = cur.fetchall()
+    if fks and all(r["on_delete"] == "CASCADE" for r in fks):
+        return
+    old_cols = _table_columns(conn, table)
+    # DROP TABLE also drops the AUTOINCREMENT high-water mark; keep it so ids
+    # of deleted rows are never handed out again
+    cur.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (table,))
+    seq_row = cur.fetchone()
+
+    cur.execute(f"CREATE TABLE {table}__new ({columns_sql})")
+    cols = ", ".join(c for c in _table_columns(conn, f"{table}__new") if c in old_cols)
+    cur.execute(f"INSERT INTO {table}__new ({cols}) SELECT {cols} FROM {table}")
+    cur.execute(f"DROP TABLE {table}")
+    cur.execute(f"ALTER TABLE {table}__new RENAME TO {table}")
+
+    if seq_row is not None:
+        cur.execute("UPDATE sqlite_sequence SET seq = max(seq, ?) WHERE name = ?", (seq_row["seq"], table))
+        if cur.rowcount == 0:
+            cur.execute("INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)", (table, seq_row["seq"]))
+
+    # Rows the old schema let in without a parent (e.g. donations saved with
+    # shelter_id=0) are kept as they are; turning foreign_keys on does not
+    # re-check them. Only report them so an operator can decide.
+    cur.execute(f"PRAGMA foreign_key_check({table})")
+    orphans = [r["rowid"] for r in cur.fetchall()]
+    if orphans:
+        app.logger.warning("%s: %d row(s) without a parent kept: ids %s", table, len(orphans), orphans)
 
 
 def init_db() -> None:
+    # Whole schema setup runs in one transaction, i.e. one commit / fsync.
+    # foreign_keys can only be switched outside a transaction; it is off here
+    # so the cascade rebuild in _ensure_cascade() can drop/rename tables.
     conn = get_db()
+    conn.execute("PRAGMA foreign_keys=OFF")
+    try:
+        with db_transaction(conn):
+            _create_schema(conn)
+    finally:
+        conn.execute("PRAGMA foreign_keys=ON")
+
+
+def _create_schema(conn: sqlite3.Connection) -> None:
     cur = conn.cursor()
 
     # Users
@@ -131,36 +322,10 @@ def init_db() -> None:
         )
     """)
 
-    # Donations / volunteer intents
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS donations (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER NOT NULL,
-            category TEXT NOT NULL,
-            shelter_id INTEGER NOT NULL,
-            amount REAL NOT NULL DEFAULT 0,
-            details TEXT NOT NULL DEFAULT '',
-            message TEXT NOT NULL DEFAULT '',
-            created_at TEXT NOT NULL DEFAULT (datetime('now')),
-            FOREIGN KEY(user_id) REFERENCES users(id),
-            FOREIGN KEY(shelter_id) REFERENCES shelters(id)
-        )
-    """)
-
-    # Animals (uploaded by shelters)
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS animals (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            shelter_id INTEGER NOT NULL,
-            name TEXT NOT NULL,
-            species TEXT NOT NULL DEFAULT '',
-            age TEXT NOT NULL DEFAULT '',
-            story TEXT NOT NULL DEFAULT '',
-            photo_filename TEXT NOT NULL DEFAULT '',
-            created_at TEXT NOT NULL DEFAULT (datetime('now')),
-            FOREIGN KEY(shelter_id) REFERENCES shelters(id)
-        )
-    """)
+    # Donations and animals, with their parent foreign keys cascading
+    for table, columns_sql in _CASCADE_TABLES.items():
+        cur.execute(f"CREATE TABLE IF NOT EXISTS {table} ({columns_sql})")
+        _ensure_cascade(conn, table, columns_sql)
 
     # Public reports (animals found / sick / injured)
     cur.execute("""
@@ -174,19 +339,19 @@ def init_db() -> None:
         )
     """)
 
-    conn.commit()
+    # Indexes for the foreign-key / status lookups and the admin list ordering.
+    # The rowid is the implicit last key, so idx_shelter_requests_submitted
+    # also serves ORDER BY submitted_at DESC, id DESC; shelters/users are
+    # listed by id and walk the INTEGER PRIMARY KEY directly.
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_animals_shelter ON animals(shelter_id)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_donations_user ON donations(user_id)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_donations_shelter ON donations(shelter_id)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_shelter_requests_status ON shelter_requests(status)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_shelter_requests_submitted ON shelter_requests(submitted_at)")
 
     # Safe migrations
-    _ensure_column(conn, "admins", "must_reset_password", "INTEGER NOT NULL DEFAULT 1")
-    _ensure_column(conn, "shelters", "photo_filename", "TEXT NOT NULL DEFAULT ''")
-    _ensure_column(conn, "shelters", "password_hash", "TEXT NOT NULL DEFAULT ''")
-    _ensure_column(conn, "shelters", "shelter_type", "TEXT NOT NULL DEFAULT 'General'")
-    _ensure_column(conn, "shelters", "urgent_level", "INTEGER NOT NULL DEFAULT 0")
-    _ensure_column(conn, "shelters", "pickup_service", "INTEGER NOT NULL DEFAULT 1")
-    _ensure_column(conn, "shelter_requests", "photo_filename", "TEXT NOT NULL DEFAULT ''")
-    _ensure_column(conn, "shelter_requests", "password_hash", "TEXT NOT NULL DEFAULT ''")
-    _ensure_column(conn, "shelter_requests", "shelter_type", "TEXT NOT NULL DEFAULT 'General'")
-    _ensure_column(conn, "shelter_requests", "pickup_service", "INTEGER NOT NULL DEFAULT 1")
+    for table, columns in _MIGRATIONS.items():
+        _ensure_columns(conn, table, columns)
 
     # Create default admin if none exists
     cur = conn.cursor()
@@ -195,68 +360,170 @@ def init_db() -> None:
     if cnt == 0:
         cur.execute(
             "INSERT INTO admins (username, password_hash, full_name, email, phone, must_reset_password) VALUES (?, ?, ?, ?, ?, ?)",
-            ("admin", generate_password_hash("admin"), "Admin", "admin@local", "", 1),
+            ("admin", hash_password("admin"), "Admin", "admin@local", "", 1),
         )
-        conn.commit()
 
-    conn.close()
+
+_db_ready = False
+_db_init_lock = threading.Lock()
 
 
 @app.before_request
 def _init_db_before_requests():
-    init_db()
+    # The schema only needs to be created / migrated once per process
+    global _db_ready
+    if _db_ready:
+        return
+    with _db_init_lock:
+        if not _db_ready:
+            init_db()
+            _db_ready = True
 
 
 # -----------------------
 # Auth helpers
 # -----------------------
 
-def current_user() -> Optional[Dict[str, Any]]:
+# Argument-less URLs used by redirects, keyed by mount point (script_root)
+_url_cache: Dict[Tuple[str, str], str] = {}
+
+
+def cached_url_for(endpoint: str) -> str:
+    # Such a URL never changes for a given script_root, so build it through
+    # the URL map once and reuse the string on every later redirect
+    key = (request.script_root, endpoint)
+    url = _url_cache.get(key)
+    if url is None:
+        url = _url_cache[key] = url_for(endpoint)
+    return url
+
+
+def current_user() -> Optional[sqlite3.Row]:
+    # Looked up at most once per request; the Row goes to templates as is
+    # (Jinja falls back to item access for u.name), no dict() copy
+    if "_current_user" in g:
+        return g._current_user
     user_id = session.get("user_id")
     if not user_id:
         return None
     conn = get_db()
     cur = conn.cursor()
-    cur.execute("SELECT * FROM users WHERE id = ?", (user_id,))
+    cur.execute("SELECT id, first_name, last_name, email, phone, avatar_url FROM users WHERE id = ?", (user_id,))
     row = cur.fetchone()
-    conn.close()
-    return dict(row) if row else None
+    g._current_user = row
+    return g._current_user
 
 
-def current_admin() -> Optional[Dict[str, Any]]:
+def current_admin() -> Optional[sqlite3.Row]:
+    # Looked up at most once per request
+    if "_current_admin" in g:
+        return g._current_admin
     admin_id = session.get("admin_id")
     if not admin_id:
         return None
     conn = get_db()
     cur = conn.cursor()
-    cur.execute("SELECT * FROM admins WHERE id = ?", (admin_id,))
+    cur.execute(
+        "SELECT id, username, full_name, email, phone, must_reset_password FROM admins WHERE id = ?",
+        (admin_id,),
+    )
     row = cur.fetchone()
-    conn.close()
-    return dict(row) if row else None
+    g._current_admin = row
+    return g._current_admin
 
 
-def current_shelter() -> Optional[Dict[str, Any]]:
+def current_shelter() -> Optional[sqlite3.Row]:
+    # Looked up at most once per request
+    if "_current_shelter" in g:
+        return g._current_shelter
     shelter_id = session.get("shelter_id")
     if not shelter_id:
         return None
     conn = get_db()
     cur = conn.cursor()
-    cur.execute("SELECT * FROM shelters WHERE id = ?", (shelter_id,))
+    cur.execute(
+        """SELECT id, name, email, phone, address, website, photo_filename,
+                  shelter_type, urgent_level, pickup_service
+             FROM shelters WHERE id = ?""",
+        (shelter_id,),
+    )
     row = cur.fetchone()
-    conn.close()
-    return dict(row) if row else None
+    g._current_shelter = row
+    return g._current_shelter
+
+
+def hash_password(password: str) -> str:
+    return generate_password_hash(password, method=PASSWORD_HASH_METHOD)
+
+
+_PW_CACHE_SIZE = 1024
+_PW_CACHE_TTL = 60  # seconds
+
+_pw_cache: "OrderedDict[bytes, float]" = OrderedDict()
+_pw_cache_lock = threading.Lock()
+_pw_cache_secret = os.urandom(32)
+
+
+def _pw_cache_key(password_hash: str, password: str) -> bytes:
+    # Keyed, fixed-length digest: the cache never holds or compares the raw
+    # password, and lookup cost does not depend on what was typed
+    mac = hmac.new(_pw_cache_secret, digestmod=hashlib.sha256)
+    for part in (password_hash.encode(), password.encode()):
+        mac.update(len(part).to_bytes(4, "big"))
+        mac.update(part)
+    return mac.digest()
+
+
+def verify_password(password_hash: str, password: str) -> bool:
+    # check_password_hash is slow on purpose; remember recent successful
+    # checks for a short while so repeated logins skip the key derivation.
+    # Failed checks are not cached, so guessing stays as slow as before.
+    key = _pw_cache_key(password_hash, password)
+    now = time.monotonic()
+    with _pw_cache_lock:
+        expires = _pw_cache.get(key)
+        if expires is not None:
+            if expires > now:
+                _pw_cache.move_to_end(key)
+                return True
+            del _pw_cache[key]
+
+    if not check_password_hash(password_hash, password):
+        return False
+
+    with _pw_cache_lock:
+        _pw_cache[key] = now + _PW_CACHE_TTL
+        _pw_cache.move_to_end(key)
+        while len(_pw_cache) > _PW_CACHE_SIZE:
+            _pw_cache.popitem(last=False)
+    return True
 
 
 def require_admin():
+    # Only the signed session cookie is checked, no query per admin page;
+    # current_admin() loads the row lazily when something needs it
     if not session.get("admin_id"):
-        return redirect(url_for("admin_login"))
+        return redirect(cached_url_for("admin_login"))
+    return None
+
+
+# Admin endpoints reachable without an admin session
+_ADMIN_PUBLIC_ENDPOINTS = {"admin_login", "admin_logout"}
+
+
+@app.before_request
+def _admin_guard():
+    # One check for every /admin/ page instead of a require_admin() call at
+    # the top of each handler
+    if request.path.startswith("/admin/") and request.endpoint not in _ADMIN_PUBLIC_ENDPOINTS:
+        return require_admin()
     return None
 
 
 def require_user():
     if not session.get("user_id"):
         flash("Pentru a ajuta, trebuie să fii autentificat.", "error")
-        return redirect(url_for("ajuta"))
+        return redirect(cached_url_for("ajuta"))
     return None
 
 
@@ -273,14 +540,57 @@ def save_uploaded_photo(file_storage) -> str:
     fname = secure_filename(file_storage.filename)
     base, ext = os.path.splitext(fname)
     candidate = fname
-    i = 1
-    while os.path.exists(os.path.join(UPLOAD_FOLDER, candidate)):
-        candidate = f"{base}_{i}{ext}"
-        i += 1
-    file_storage.save(os.path.join(UPLOAD_FOLDER, candidate))
+    while True:
+        # "x" creates the file atomically, so two uploads can never pick the same name
+        try:
+            out = open(os.path.join(UPLOAD_FOLDER, candidate), "xb")
+            break
+        except FileExistsError:
+            candidate = f"{base}_{uuid.uuid4().hex[:8]}{ext}"
+    with out:
+        shutil.copyfileobj(file_storage.stream, out, length=64 * 1024)
     return candidate
 
 
+_SHELTERS_CACHE_TTL = 30  # seconds
+
+_shelters_cache: Dict[str, Any] = {"rows": None, "expires": 0.0, "version": 0}
+_shelters_cache_lock = threading.Lock()
+
+
+def public_shelters() -> List[sqlite3.Row]:
+    # The public list changes rarely; serve it from memory for a few seconds.
+    # Only the rows are cached, the page itself still depends on the session.
+    now = time.monotonic()
+    # Read the entry once: invalidate_shelters_cache() may clear "rows" from
+    # another thread between a check and a second lookup
+    with _shelters_cache_lock:
+        rows = _shelters_cache["rows"]
+        expires = _shelters_cache["expires"]
+        version = _shelters_cache["version"]
+    if rows is not None and expires > now:
+        return rows
+
+    conn = get_db()
+    cur = conn.cursor()
+    cur.execute(
+        """SELECT id, name, email, phone, address, website, photo_filename, shelter_type, urgent_level
+             FROM shelters ORDER BY id DESC"""
+    )
+    rows = cur.fetchall()
+    with _shelters_cache_lock:
+        # Don't store rows read before a concurrent invalidation
+        if _shelters_cache["version"] == version:
+            _shelters_cache.update(rows=rows, expires=now + _SHELTERS_CACHE_TTL)
+    return rows
+
+
+def invalidate_shelters_cache() -> None:
+    with _shelters_cache_lock:
+        _shelters_cache["version"] += 1
+        _shelters_cache["rows"] = None
+
+
 # -----------------------
 # Public pages
 # -----------------------
@@ -292,12 +602,7 @@ def home():
 
 @app.route("/adaposturi")
 def adaposturi():
-    conn = get_db()
-    cur = conn.cursor()
-    cur.execute("SELECT * FROM shelters ORDER BY id DESC")
-    shelters = [dict(r) for r in cur.fetchall()]
-    conn.close()
-    return render_template("shelters.html", shelters=shelters)
+    return render_template("shelters.html", shelters=public_shelters())
 
 
 @app.route("/raporteaza", methods=["GET", "POST"])
@@ -319,9 +624,8 @@ def raporteaza():
             (reporter_name, reporter_phone, reporter_email, description),
         )
         conn.commit()
-        conn.close()
 
-        return redirect(url_for("raporteaza_confirmare"))
+        return redirect(cached_url_for("raporteaza_confirmare"))
 
     return render_template("raporteaza.html")
 
@@ -335,7 +639,7 @@ def raporteaza_confirmare():
 def contact():
     if request.method == "POST":
         flash("Mesaj trimis. Mulțumim!", "success")
-        return redirect(url_for("contact"))
+        return redirect(cached_url_for("contact"))
     return render_template("contact.html")
 
 
@@ -352,30 +656,29 @@ def login_utilizator():
 
         if not email or not password:
             flash("Emailul și parola sunt obligatorii.", "error")
-            return render_template("login_user.html", current_user=current_user())
+            return render_template("login_user.html")
 
         conn = get_db()
         cur = conn.cursor()
-        cur.execute("SELECT * FROM users WHERE email = ?", (email,))
+        cur.execute("SELECT id, password_hash FROM users WHERE email = ?", (email,))
         user = cur.fetchone()
-        conn.close()
 
-        if not user or not check_password_hash(user["password_hash"], password):
+        if not user or not verify_password(user["password_hash"], password):
             flash("Email sau parolă incorecte.", "error")
-            return render_template("login_user.html", current_user=current_user())
+            return render_template("login_user.html")
 
         session["user_id"] = int(user["id"])
         flash("Autentificat cu succes.", "success")
-        return redirect(url_for("home"))
+        return redirect(cached_url_for("home"))
 
-    return render_template("login_user.html", current_user=current_user())
+    return render_template("login_user.html")
 
 
 @app.route("/logout")
 def logout():
     session.pop("user_id", None)
     flash("Te-ai delogat.", "success")
-    return redirect(url_for("home"))
+    return redirect(cached_url_for("home"))
 
 
 @app.route("/login/adapost", methods=["GET", "POST"])
@@ -386,29 +689,28 @@ def login_adapost():
 
         if not email or not password:
             flash("Emailul și parola sunt obligatorii.", "error")
-            return render_template("login_shelter.html", current_user=current_user())
+            return render_template("login_shelter.html")
 
         conn = get_db()
         cur = conn.cursor()
-        cur.execute("SELECT * FROM shelters WHERE email = ?", (email,))
+        cur.execute("SELECT id, password_hash FROM shelters WHERE email = ?", (email,))
         sh = cur.fetchone()
-        conn.close()
 
-        if not sh or not sh["password_hash"] or not check_password_hash(sh["password_hash"], password):
+        if not sh or not sh["password_hash"] or not verify_password(sh["password_hash"], password):
             flash("Email sau parolă incorecte (sau adăpostul nu e aprobat).", "error")
-            return render_template("login_shelter.html", current_user=current_user())
+            return render_template("login_shelter.html")
 
         session["shelter_id"] = int(sh["id"])
         flash("Adăpost autentificat.", "success")
-        return redirect(url_for("shelter_dashboard"))
+        return redirect(cached_url_for("shelter_dashboard"))
 
-    return render_template("login_shelter.html", current_user=current_user())
+    return render_template("login_shelter.html")
 
 
 def require_shelter():
     if not session.get("shelter_id"):
         flash("Trebuie să te autentifici ca adăpost.", "error")
-        return redirect(url_for("login_adapost"))
+        return redirect(cached_url_for("login_adapost"))
     return None
 
 
@@ -416,7 +718,7 @@ def require_shelter():
 def logout_adapost():
     session.pop("shelter_id", None)
     flash("Te-ai delogat.", "success")
-    return redirect(url_for("home"))
+    return redirect(cached_url_for("home"))
 
 
 @app.route("/shelter/dashboard")
@@ -429,13 +731,16 @@ def shelter_dashboard():
     if not sh:
         session.pop("shelter_id", None)
         flash("Sesiune invalidă. Autentifică-te din nou.", "error")
-        return redirect(url_for("login_adapost"))
+        return redirect(cached_url_for("login_adapost"))
 
     conn = get_db()
     cur = conn.cursor()
-    cur.execute("SELECT * FROM animals WHERE shelter_id = ? ORDER BY id DESC", (sh["id"],))
-    animals = [dict(r) for r in cur.fetchall()]
-    conn.close()
+    cur.execute(
+        """SELECT id, name, species, age, story, photo_filename
+             FROM animals WHERE shelter_id = ? ORDER BY id DESC""",
+        (sh["id"],),
+    )
+    animals = cur.fetchall()
 
     return render_template("shelter_dashboard.html", shelter=sh, animals=animals)
 
@@ -446,11 +751,7 @@ def shelter_animals_add():
     if guard:
         return guard
 
-    sh = current_shelter()
-    if not sh:
-        session.pop("shelter_id", None)
-        flash("Sesiune invalidă. Autentifică-te din nou.", "error")
-        return redirect(url_for("login_adapost"))
+    sh_id = session["shelter_id"]
 
     name = (request.form.get("name") or "").strip()
     species = (request.form.get("species") or "").strip()
@@ -459,22 +760,30 @@ def shelter_animals_add():
 
     if not name:
         flash("Numele animalului este obligatoriu.", "error")
-        return redirect(url_for("shelter_dashboard"))
+        return redirect(cached_url_for("shelter_dashboard"))
 
     photo_filename = save_uploaded_photo(request.files.get("photo"))
 
     conn = get_db()
     cur = conn.cursor()
+    # The shelter check is part of the INSERT, no separate lookup needed
     cur.execute(
         """INSERT INTO animals (shelter_id, name, species, age, story, photo_filename)
-             VALUES (?, ?, ?, ?, ?, ?)""",
-        (sh["id"], name, species, age, story, photo_filename),
+             SELECT id, ?, ?, ?, ?, ? FROM shelters WHERE id = ?""",
+        (name, species, age, story, photo_filename, sh_id),
     )
     conn.commit()
-    conn.close()
+
+    if cur.rowcount == 0:
+        if photo_filename:
+            with contextlib.suppress(OSError):
+                os.remove(os.path.join(UPLOAD_FOLDER, photo_filename))
+        session.pop("shelter_id", None)
+        flash("Sesiune invalidă. Autentifică-te din nou.", "error")
+        return redirect(cached_url_for("login_adapost"))
 
     flash("Animal adăugat.", "success")
-    return redirect(url_for("shelter_dashboard"))
+    return redirect(cached_url_for("shelter_dashboard"))
 
 
 @app.route("/shelter/animals/<int:animal_id>/edit", methods=["GET", "POST"])
@@ -483,18 +792,14 @@ def shelter_animals_edit(animal_id: int):
     if guard:
         return guard
 
-    sh = current_shelter()
-    if not sh:
-        session.pop("shelter_id", None)
-        flash("Sesiune invalidă. Autentifică-te din nou.", "error")
-        return redirect(url_for("login_adapost"))
+    # Ownership is enforced by "shelter_id = ?" in every query below
+    sh_id = session["shelter_id"]
 
     conn = get_db()
     cur = conn.cursor()
-    cur.execute("SELECT * FROM animals WHERE id = ? AND shelter_id = ?", (animal_id, sh["id"]))
+    cur.execute("SELECT * FROM animals WHERE id = ? AND shelter_id = ?", (animal_id, sh_id))
     animal = cur.fetchone()
     if not animal:
-        conn.close()
         abort(404)
 
     if request.method == "POST":
@@ -505,7 +810,6 @@ def shelter_animals_edit(animal_id: int):
 
         if not name:
             flash("Numele animalului este obligatoriu.", "error")
-            conn.close()
             return redirect(url_for("shelter_animals_edit", animal_id=animal_id))
 
         photo_filename = animal["photo_filename"] or ""
@@ -514,28 +818,22 @@ def shelter_animals_edit(animal_id: int):
             new_saved = save_uploaded_photo(new_photo)
             if new_saved:
                 if photo_filename:
-                    old_path = os.path.join(UPLOAD_FOLDER, photo_filename)
-                    if os.path.exists(old_path):
-                        try:
-                            os.remove(old_path)
-                        except OSError:
-                            pass
+                    with contextlib.suppress(OSError):
+                        os.remove(os.path.join(UPLOAD_FOLDER, photo_filename))
                 photo_filename = new_saved
 
         cur.execute(
             """UPDATE animals
                  SET name=?, species=?, age=?, story=?, photo_filename=?
                  WHERE id=? AND shelter_id=?""",
-            (name, species, age, story, photo_filename, animal_id, sh["id"]),
+            (name, species, age, story, photo_filename, animal_id, sh_id),
         )
         conn.commit()
-        conn.close()
 
         flash("Animal actualizat.", "success")
-        return redirect(url_for("shelter_dashboard"))
+        return redirect(cached_url_for("shelter_dashboard"))
 
-    conn.close()
-    return render_template("shelter_animal_edit.html", shelter=sh, animal=dict(animal))
+    return render_template("shelter_animal_edit.html", animal=animal)
 
 
 @app.route("/shelter/animals/<int:animal_id>/delete", methods=["POST"])
@@ -544,35 +842,26 @@ def shelter_animals_delete(animal_id: int):
     if guard:
         return guard
 
-    sh = current_shelter()
-    if not sh:
-        session.pop("shelter_id", None)
-        flash("Sesiune invalidă. Autentifică-te din nou.", "error")
-        return redirect(url_for("login_adapost"))
+    # Ownership is enforced by "shelter_id = ?" in every query below
+    sh_id = session["shelter_id"]
 
     conn = get_db()
     cur = conn.cursor()
-    cur.execute("SELECT photo_filename FROM animals WHERE id = ? AND shelter_id = ?", (animal_id, sh["id"]))
+    cur.execute("SELECT photo_filename FROM animals WHERE id = ? AND shelter_id = ?", (animal_id, sh_id))
     row = cur.fetchone()
     if not row:
-        conn.close()
         abort(404)
 
     photo_filename = row["photo_filename"] or ""
-    cur.execute("DELETE FROM animals WHERE id = ? AND shelter_id = ?", (animal_id, sh["id"]))
+    cur.execute("DELETE FROM animals WHERE id = ? AND shelter_id = ?", (animal_id, sh_id))
     conn.commit()
-    conn.close()
 
     if photo_filename:
-        p = os.path.join(UPLOAD_FOLDER, photo_filename)
-        if os.path.exists(p):
-            try:
-                os.remove(p)
-            except OSError:
-                pass
+        with contextlib.suppress(OSError):
+            os.remove(os.path.join(UPLOAD_FOLDER, photo_filename))
 
     flash("Animal șters.", "success")
-    return redirect(url_for("shelter_dashboard"))
+    return redirect(cached_url_for("shelter_dashboard"))
 
 
 @app.route("/register/utilizator", methods=["GET", "POST"])
@@ -587,37 +876,35 @@ def register_user():
 
         if not email or not password:
             flash("Emailul și parola sunt obligatorii.", "error")
-            return render_template("register_user.html", current_user=current_user())
+            return render_template("register_user.html")
 
         if password != password2:
             flash("Parolele nu coincid.", "error")
-            return render_template("register_user.html", current_user=current_user())
+            return render_template("register_user.html")
 
         conn = get_db()
         cur = conn.cursor()
         try:
             cur.execute(
                 "INSERT INTO users (first_name, last_name, email, phone, password_hash) VALUES (?, ?, ?, ?, ?)",
-                (first_name, last_name, email, phone, generate_password_hash(password)),
+                (first_name, last_name, email, phone, hash_password(password)),
             )
             conn.commit()
         except sqlite3.IntegrityError:
-            conn.close()
             flash("Există deja un cont cu acest email.", "error")
-            return render_template("register_user.html", current_user=current_user())
-        conn.close()
+            return render_template("register_user.html")
 
         flash("Cont creat. Te poți autentifica.", "success")
-        return redirect(url_for("login_utilizator"))
+        return redirect(cached_url_for("login_utilizator"))
 
-    return render_template("register_user.html", current_user=current_user())
+    return render_template("register_user.html")
 
 
 @app.route("/profil")
 def profil():
     u = current_user()
     if not u:
-        return redirect(url_for("login_utilizator"))
+        return redirect(cached_url_for("login_utilizator"))
     return render_template("profil.html", user=u, current_user=u)
 
 
@@ -625,7 +912,7 @@ def profil():
 def profil_edit():
     u = current_user()
     if not u:
-        return redirect(url_for("login_utilizator"))
+        return redirect(cached_url_for("login_utilizator"))
 
     if request.method == "POST":
         first_name = (request.form.get("first_name") or "").strip()
@@ -635,29 +922,17 @@ def profil_edit():
 
         conn = get_db()
         cur = conn.cursor()
-        if _table_has_column(conn, "users", "avatar_url"):
-            cur.execute(
-                "UPDATE users SET first_name=?, last_name=?, phone=?, avatar_url=? WHERE id=?",
-                (first_name, last_name, phone, avatar_url, u["id"]),
-            )
-        else:
-            _ensure_column(conn, "users", "avatar_url", "TEXT NOT NULL DEFAULT ''")
-            cur.execute(
-                "UPDATE users SET first_name=?, last_name=?, phone=?, avatar_url=? WHERE id=?",
-                (first_name, last_name, phone, avatar_url, u["id"]),
-            )
+        cur.execute(
+            "UPDATE users SET first_name=?, last_name=?, phone=?, avatar_url=? WHERE id=?",
+            (first_name, last_name, phone, avatar_url, u["id"]),
+        )
         conn.commit()
-        conn.close()
 
         flash("Profil actualizat.", "success")
-        return redirect(url_for("profil"))
+        return redirect(cached_url_for("profil"))
 
-    conn = get_db()
-    cur = conn.cursor()
-    cur.execute("SELECT * FROM users WHERE id=?", (u["id"],))
-    user = cur.fetchone()
-    conn.close()
-    return render_template("edit_profile.html", user=dict(user), current_user=u)
+    # current_user() already loaded every field the form shows
+    return render_template("edit_profile.html", user=u, current_user=u)
 
 
 @app.route("/adaposturi/devino", methods=["GET", "POST"])
@@ -674,11 +949,11 @@ def shelter_apply():
 
         if not name or not email or not password:
             flash("Numele, emailul și parola sunt obligatorii.", "error")
-            return render_template("shelter_apply.html", current_user=current_user())
+            return render_template("shelter_apply.html")
 
         if password != password2:
             flash("Parolele nu coincid.", "error")
-            return render_template("shelter_apply.html", current_user=current_user())
+            return render_template("shelter_apply.html")
 
         photo_filename = save_uploaded_photo(request.files.get("photo"))
 
@@ -687,22 +962,21 @@ def shelter_apply():
         cur.execute(
             """INSERT INTO shelter_requests (name, email, phone, address, description, website, photo_filename, password_hash)
                VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-            (name, email, phone, address, description, website, photo_filename, generate_password_hash(password)),
+            (name, email, phone, address, description, website, photo_filename, hash_password(password)),
         )
         conn.commit()
-        conn.close()
 
         flash("Cerere trimisă. Adminul o va analiza.", "success")
-        return redirect(url_for("adaposturi"))
+        return redirect(cached_url_for("adaposturi"))
 
-    return render_template("shelter_apply.html", current_user=current_user())
+    return render_template("shelter_apply.html")
 
 
 @app.route("/ajuta", methods=["GET", "POST"])
 def ajuta():
     if request.method == "POST":
         # form handler is in category
-        return redirect(url_for("ajuta"))
+        return redirect(cached_url_for("ajuta"))
     return render_template("ajuta.html")
 
 
@@ -714,12 +988,10 @@ def ajuta_category(category: str):
     u = current_user()
     if not u:
         flash("Pentru a ajuta, trebuie să fii autentificat.", "error")
-        return redirect(url_for("login_utilizator"))
+        return redirect(cached_url_for("login_utilizator"))
 
     conn = get_db()
     cur = conn.cursor()
-    cur.execute("SELECT * FROM shelters ORDER BY urgent_level DESC, id DESC")
-    shelters = [dict(r) for r in cur.fetchall()]
 
     if request.method == "POST":
         mode = request.form.get("mode") or "auto"
@@ -732,31 +1004,124 @@ def ajuta_category(category: str):
         if mode == "manual" and chosen_ids:
             shelter_id = int(chosen_ids[0])
         else:
-            shelter_id = int(shelters[0]["id"]) if shelters else 0
+            # Most urgent shelter; only its id is needed
+            cur.execute("SELECT id FROM shelters ORDER BY urgent_level DESC, id DESC LIMIT 1")
+            row = cur.fetchone()
+            if row is None:
+                # Nothing to pick from; re-posting the same form would not help
+                flash("Momentan nu există niciun adăpost înscris. Revino mai târziu.", "error")
+                return redirect(cached_url_for("ajuta"))
+            shelter_id = int(row["id"])
 
-        cur.execute(
-            "INSERT INTO donations (user_id, category, shelter_id, amount, details, message) VALUES (?, ?, ?, ?, ?, ?)",
-            (u["id"], category, shelter_id, amount, details, message),
-        )
+        try:
+            cur.execute(
+                "INSERT INTO donations (user_id, category, shelter_id, amount, details, message) VALUES (?, ?, ?, ?, ?, ?)",
+                (u["id"], category, shelter_id, amount, details, message),
+            )
+        except sqlite3.IntegrityError:
+            # foreign key: the chosen shelter does not exist (anymore)
+            flash("Adăpostul ales nu mai există. Alege altul.", "error")
+            return redirect(url_for("ajuta_category", category=category))
         conn.commit()
-        conn.close()
 
         flash("Mulțumim! Cererea ta a fost trimisă.", "success")
-        return redirect(url_for("ajuta"))
+        return redirect(cached_url_for("ajuta"))
 
-    conn.close()
+    # The template walks the list once, so hand it the cursor itself and let
+    # rows be decoded while rendering instead of fetchall()-ing a list first
+    shelters = cur.execute(
+        "SELECT id, name, address, shelter_type, urgent_level FROM shelters ORDER BY urgent_level DESC, id DESC"
+    )
     return render_template("ajuta_category.html", category=category, shelters=shelters)
 
 
 @app.route("/doneaza")
 def doneaza_legacy():
-    return redirect(url_for("ajuta"))
+    return redirect(cached_url_for("ajuta"))
 
 
 # -----------------------
 # Admin
 # -----------------------
 
+# Fixed admin queries, kept in one place so every handler sends identical
+# SQL text and hits the connection's prepared-statement cache
+SQL_DASHBOARD_COUNTS = """
+    SELECT
+        (SELECT COUNT(*) FROM users) AS users_count,
+        (SELECT COUNT(*) FROM shelters) AS shelters_count,
+        (SELECT COUNT(*) FROM shelter_requests WHERE status='PENDING') AS pending_requests,
+        (SELECT COUNT(*) FROM donations) AS donations_count
+"""
+SQL_GET_ADMIN = "SELECT id, username, full_name, email, phone FROM admins WHERE id=?"
+SQL_LIST_USERS = "SELECT id, first_name, last_name, email, phone FROM users ORDER BY id DESC LIMIT ?"
+SQL_LIST_USERS_BEFORE = """
+    SELECT id, first_name, last_name, email, phone
+      FROM users WHERE id < ? ORDER BY id DESC LIMIT ?
+"""
+SQL_GET_USER = "SELECT id, first_name, last_name, phone FROM users WHERE id=?"
+SQL_LIST_SHELTER_REQUESTS = """
+    SELECT id, name, email, phone, address, website, description, status, submitted_at, reviewed_at
+      FROM shelter_requests ORDER BY submitted_at DESC, id DESC LIMIT ?
+"""
+SQL_LIST_SHELTER_REQUESTS_BEFORE = """
+    SELECT id, name, email, phone, address, website, description, status, submitted_at, reviewed_at
+      FROM shelter_requests
+     WHERE (submitted_at, id) < (SELECT submitted_at, id FROM shelter_requests WHERE id = ?)
+     ORDER BY submitted_at DESC, id DESC LIMIT ?
+"""
+SQL_GET_SHELTER_REQUEST = """
+    SELECT id, name, email, phone, address, website, description, status, submitted_at, reviewed_at
+      FROM shelter_requests WHERE id = ?
+"""
+SQL_LIST_SHELTERS = "SELECT id, name, email, phone, address, photo_filename FROM shelters ORDER BY id DESC LIMIT ?"
+SQL_LIST_SHELTERS_BEFORE = """
+    SELECT id, name, email, phone, address, photo_filename
+      FROM shelters WHERE id < ? ORDER BY id DESC LIMIT ?
+"""
+SQL_GET_SHELTER = "SELECT id, name, email, phone, address, website, description FROM shelters WHERE id=?"
+
+ADMIN_PAGE_SIZE = 50
+
+
+def _admin_page(cur: sqlite3.Cursor, first_sql: str, before_sql: str) -> Tuple[List[sqlite3.Row], Optional[int]]:
+    # Keyset pagination: ?before=<id of the last row shown> selects the next
+    # page. One extra row is fetched only to know whether a next page exists.
+    before = request.args.get("before", type=int)
+    if before is None:
+        cur.execute(first_sql, (ADMIN_PAGE_SIZE + 1,))
+    else:
+        cur.execute(before_sql, (before, ADMIN_PAGE_SIZE + 1))
+    rows = cur.fetchall()
+    if len(rows) > ADMIN_PAGE_SIZE:
+        rows = rows[:ADMIN_PAGE_SIZE]
+        return rows, rows[-1]["id"]
+    return rows, None
+
+
+def _stream_page(template: str, **context: Any):
+    # Render the admin lists chunk by chunk instead of building the whole
+    # page in memory. The session cookie goes out with the headers, before
+    # the body is rendered, so pop the flashes now; every streamed template
+    # shows them (base.html or its own flash block) from the request cache.
+    get_flashed_messages(with_categories=True)
+    return app.response_class(stream_template(template, **context), mimetype="text/html")
+
+
+def _is_htmx() -> bool:
+    return request.headers.get("HX-Request") == "true"
+
+
+def _htmx_partial(message: str, template: Optional[str] = None, **context: Any):
+    # HTMX mutation: answer with just the changed row (nothing for a delete,
+    # so the row is swapped out) and the flash as an HX-Trigger event that
+    # admin_htmx.html shows; the list page and its query are not re-run
+    body = render_template(template, **context) if template else ""
+    resp = app.response_class(body, mimetype="text/html")
+    resp.headers["HX-Trigger"] = json.dumps({"flash": {"category": "success", "message": message}})
+    return resp
+
+
 @app.route("/admin/", methods=["GET", "POST"])
 def admin_login():
     if request.method == "POST":
@@ -765,20 +1130,19 @@ def admin_login():
 
         conn = get_db()
         cur = conn.cursor()
-        cur.execute("SELECT * FROM admins WHERE username = ?", (username,))
+        cur.execute("SELECT id, password_hash, must_reset_password FROM admins WHERE username = ?", (username,))
         admin = cur.fetchone()
-        conn.close()
 
-        if not admin or not check_password_hash(admin["password_hash"], password):
+        if not admin or not verify_password(admin["password_hash"], password):
             flash("Username sau parolă incorecte.", "error")
             return render_template("admin_login.html")
 
         session["admin_id"] = int(admin["id"])
 
         if int(admin["must_reset_password"] or 0) == 1:
-            return redirect(url_for("admin_reset_password"))
+            return redirect(cached_url_for("admin_reset_password"))
 
-        return redirect(url_for("admin_dashboard"))
+        return redirect(cached_url_for("admin_dashboard"))
 
     return render_template("admin_login.html")
 
@@ -787,78 +1151,54 @@ def admin_login():
 def admin_logout():
     session.pop("admin_id", None)
     flash("Delogat.", "success")
-    return redirect(url_for("home"))
+    return redirect(cached_url_for("home"))
 
 
 @app.route("/admin/reset-password")
 def admin_reset_password():
-    guard = require_admin()
-    if guard:
-        return guard
     return render_template("admin_reset_password.html")
 
 
 @app.route("/admin/reset-password", methods=["POST"])
 def admin_reset_password_save():
-    guard = require_admin()
-    if guard:
-        return guard
-
     password = request.form.get("password") or ""
     password2 = request.form.get("password2") or ""
 
     if password != password2:
         flash("Parolele nu coincid.", "error")
-        return redirect(url_for("admin_reset_password"))
+        return redirect(cached_url_for("admin_reset_password"))
 
     conn = get_db()
     cur = conn.cursor()
     cur.execute(
         "UPDATE admins SET password_hash = ?, must_reset_password = 0 WHERE id = ?",
-        (generate_password_hash(password), session["admin_id"]),
+        (hash_password(password), session["admin_id"]),
     )
     conn.commit()
-    conn.close()
 
     flash("Parolă actualizată.", "success")
-    return redirect(url_for("admin_dashboard"))
+    return redirect(cached_url_for("admin_dashboard"))
 
 
 @app.route("/admin/dashboard")
 def admin_dashboard():
-    guard = require_admin()
-    if guard:
-        return guard
-
     conn = get_db()
     cur = conn.cursor()
 
-    cur.execute("SELECT COUNT(*) AS c FROM users")
-    users_count = cur.fetchone()["c"]
-    cur.execute("SELECT COUNT(*) AS c FROM shelters")
-    shelters_count = cur.fetchone()["c"]
-    cur.execute("SELECT COUNT(*) AS c FROM shelter_requests WHERE status='PENDING'")
-    pending_requests = cur.fetchone()["c"]
-    cur.execute("SELECT COUNT(*) AS c FROM donations")
-    donations_count = cur.fetchone()["c"]
-
-    conn.close()
+    cur.execute(SQL_DASHBOARD_COUNTS)
+    counts = cur.fetchone()
 
     return render_template(
         "admin_dashboard.html",
-        users_count=users_count,
-        shelters_count=shelters_count,
-        pending_requests=pending_requests,
-        donations_count=donations_count,
+        users_count=counts["users_count"],
+        shelters_count=counts["shelters_count"],
+        pending_requests=counts["pending_requests"],
+        donations_count=counts["donations_count"],
     )
 
 
 @app.route("/admin/profile", methods=["GET", "POST"])
 def admin_profile():
-    guard = require_admin()
-    if guard:
-        return guard
-
     conn = get_db()
     cur = conn.cursor()
 
@@ -874,184 +1214,231 @@ def admin_profile():
         conn.commit()
         flash("Profil actualizat.", "success")
 
-    cur.execute("SELECT * FROM admins WHERE id=?", (session["admin_id"],))
+    cur.execute(SQL_GET_ADMIN, (session["admin_id"],))
     admin = cur.fetchone()
-    conn.close()
 
-    return render_template("admin_profile.html", admin=dict(admin))
+    return render_template("admin_profile.html", admin=admin)
 
 
 @app.route("/admin/users")
 def admin_users():
-    guard = require_admin()
-    if guard:
-        return guard
-
     conn = get_db()
     cur = conn.cursor()
-    cur.execute("SELECT * FROM users ORDER BY id DESC")
-    users = [dict(r) for r in cur.fetchall()]
-    conn.close()
+    users, next_before = _admin_page(cur, SQL_LIST_USERS, SQL_LIST_USERS_BEFORE)
 
-    return render_template("admin_users.html", users=users)
+    return _stream_page("admin_users.html", users=users, next_before=next_before)
 
 
 @app.route("/admin/users/<int:user_id>/edit", methods=["GET", "POST"])
 def admin_user_edit(user_id: int):
-    guard = require_admin()
-    if guard:
-        return guard
-
     conn = get_db()
     cur = conn.cursor()
-    cur.execute("SELECT * FROM users WHERE id=?", (user_id,))
-    user = cur.fetchone()
-    if not user:
-        conn.close()
-        abort(404)
 
     if request.method == "POST":
         first_name = (request.form.get("first_name") or "").strip()
         last_name = (request.form.get("last_name") or "").strip()
         phone = (request.form.get("phone") or "").strip()
 
+        # A single UPDATE both checks that the user exists and saves
         cur.execute("UPDATE users SET first_name=?, last_name=?, phone=? WHERE id=?",
                     (first_name, last_name, phone, user_id))
         conn.commit()
-        conn.close()
+        if cur.rowcount == 0:
+            abort(404)
 
         flash("Utilizator actualizat.", "success")
-        return redirect(url_for("admin_users"))
+        return redirect(cached_url_for("admin_users"))
 
-    conn.close()
-    return render_template("admin_user_edit.html", user=dict(user))
+    cur.execute(SQL_GET_USER, (user_id,))
+    user = cur.fetchone()
+    if not user:
+        abort(404)
+    return render_template("admin_user_edit.html", user=user)
 
 
 @app.route("/admin/users/<int:user_id>/delete", methods=["POST"])
 def admin_user_delete(user_id: int):
-    guard = require_admin()
-    if guard:
-        return guard
-
     conn = get_db()
     cur = conn.cursor()
     cur.execute("DELETE FROM users WHERE id=?", (user_id,))
     conn.commit()
-    conn.close()
 
+    if _is_htmx():
+        return _htmx_partial("Utilizator șters.")
     flash("Utilizator șters.", "success")
-    return redirect(url_for("admin_users"))
+    return redirect(cached_url_for("admin_users"))
 
 
 @app.route("/admin/shelter-requests")
 def admin_shelter_requests():
-    guard = require_admin()
-    if guard:
-        return guard
-
     conn = get_db()
     cur = conn.cursor()
-    cur.execute("SELECT * FROM shelter_requests ORDER BY submitted_at DESC")
-    reqs = [dict(r) for r in cur.fetchall()]
-    conn.close()
+    reqs, next_before = _admin_page(cur, SQL_LIST_SHELTER_REQUESTS, SQL_LIST_SHELTER_REQUESTS_BEFORE)
 
-    return render_template("admin_shelter_requests.html", requests=reqs)
+    return _stream_page("admin_shelter_requests.html", requests=reqs, next_before=next_before)
 
 
 @app.route("/admin/shelter-requests/<int:req_id>/approve", methods=["POST"])
 def admin_shelter_request_approve(req_id: int):
-    guard = require_admin()
-    if guard:
-        return guard
-
     conn = get_db()
     cur = conn.cursor()
 
-    cur.execute("SELECT * FROM shelter_requests WHERE id=?", (req_id,))
-    req = cur.fetchone()
-    if not req:
-        conn.close()
-        abort(404)
-
-    cur.execute(
-        """INSERT INTO shelters (name, email, phone, address, description, website, photo_filename, password_hash, shelter_type, pickup_service)
-           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-        (
-            req["name"], req["email"], req["phone"], req["address"], req["description"],
-            req["website"], req["photo_filename"], req["password_hash"],
-            req["shelter_type"], req["pickup_service"]
-        ),
-    )
+    # Mark the request and get its columns back in one statement, then copy
+    # them into shelters; an unknown or already approved request is a 404
+    with db_transaction(conn):
+        row = cur.execute(
+            """UPDATE shelter_requests SET status='APPROVED', reviewed_at=datetime('now')
+                WHERE id=? AND status != 'APPROVED'
+            RETURNING name, email, phone, address, description, website, photo_filename, password_hash, shelter_type, pickup_service""",
+            (req_id,),
+        ).fetchone()
+        if row is None:
+            abort(404)
 
-    cur.execute("UPDATE shelter_requests SET status='APPROVED', reviewed_at=datetime('now') WHERE id=?", (req_id,))
-    conn.commit()
-    conn.close()
+        cur.execute(
+            """INSERT INTO shelters (name, email, phone, address, description, website, photo_filename, password_hash, shelter_type, pickup_service)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            tuple(row),
+        )
+    invalidate_shelters_cache()
 
+    if _is_htmx():
+        cur.execute(SQL_GET_SHELTER_REQUEST, (req_id,))
+        return _htmx_partial("Cerere aprobată.", "admin_shelter_request_item.html", r=cur.fetchone())
     flash("Cerere aprobată.", "success")
-    return redirect(url_for("admin_shelter_requests"))
+    return redirect(cached_url_for("admin_shelter_requests"))
 
 
 @app.route("/admin/shelter-requests/<int:req_id>/reject", methods=["POST"])
 def admin_shelter_request_reject(req_id: int):
-    guard = require_admin()
-    if guard:
-        return guard
-
     conn = get_db()
     cur = conn.cursor()
     cur.execute("UPDATE shelter_requests SET status='REJECTED', reviewed_at=datetime('now') WHERE id=?", (req_id,))
     conn.commit()
-    conn.close()
 
+    if _is_htmx():
+        cur.execute(SQL_GET_SHELTER_REQUEST, (req_id,))
+        row = cur.fetchone()
+        if row is None:
+            abort(404)
+        return _htmx_partial("Cerere respinsă.", "admin_shelter_request_item.html", r=row)
     flash("Cerere respinsă.", "success")
-    return redirect(url_for("admin_shelter_requests"))
+    return redirect(cached_url_for("admin_shelter_requests"))
+
+
+# Ids per bulk statement: the CASE UPDATE binds approve ids twice, so this
+# keeps each statement at <= 500 variables
+_BULK_REVIEW_CHUNK = 250
+
+
+def _id_list(value: Any) -> Optional[List[int]]:
+    # JSON list of request ids, duplicates dropped; None if malformed or an
+    # id is outside SQLite's INTEGER range (binding it would raise)
+    if value is None:
+        return []
+    if not isinstance(value, list) or not all(
+        isinstance(i, int) and not isinstance(i, bool) and 0 < i < 2**63 for i in value
+    ):
+        return None
+    return list(dict.fromkeys(value))
+
+
+@app.route("/admin/shelter-requests/bulk", methods=["POST"])
+def admin_shelter_requests_bulk():
+    # JSON {"approve": [ids], "reject": [ids]}: the whole batch is one write
+    # transaction (one lock, one commit) instead of one POST per request.
+    # Same rules as the single handlers: already approved requests are not
+    # copied into shelters again, rejecting only changes the status.
+    data = request.get_json(silent=True)
+    approve = _id_list(data.get("approve")) if isinstance(data, dict) else None
+    reject = _id_list(data.get("reject")) if isinstance(data, dict) else None
+    if approve is None or reject is None:
+        return jsonify(error='Se așteaptă JSON {"approve": [id, ...], "reject": [id, ...]}.'), 400
+    if set(approve) & set(reject):
+        return jsonify(error="O cerere nu poate fi și aprobată, și respinsă."), 400
+
+    decisions = [(i, True) for i in approve] + [(i, False) for i in reject]
+    approved = rejected = 0
+
+    conn = get_db()
+    cur = conn.cursor()
+    try:
+        with db_transaction(conn):
+            for start in range(0, len(decisions), _BULK_REVIEW_CHUNK):
+                chunk = decisions[start:start + _BULK_REVIEW_CHUNK]
+                a_ids = [i for i, is_approve in chunk if is_approve]
+                r_ids = [i for i, is_approve in chunk if not is_approve]
+                a_marks = ",".join("?" * len(a_ids)) or "NULL"
+                r_marks = ",".join("?" * len(r_ids)) or "NULL"
+
+                # Copy before the UPDATE, while status still tells which
+                # requests are newly approved
+                copied = 0
+                if a_ids:
+                    cur.execute(
+                        f"""INSERT INTO shelters (name, email, phone, address, description, website, photo_filename, password_hash, shelter_type, pickup_service)
+                            SELECT name, email, phone, address, description, website, photo_filename, password_hash, shelter_type, pickup_service
+                              FROM shelter_requests WHERE id IN ({a_marks}) AND status != 'APPROVED'""",
+                        a_ids,
+                    )
+                    copied = cur.rowcount
+
+                cur.execute(
+                    f"""UPDATE shelter_requests
+                           SET status = CASE WHEN id IN ({a_marks}) THEN 'APPROVED' ELSE 'REJECTED' END,
+                               reviewed_at = datetime('now')
+                         WHERE (id IN ({a_marks}) AND status != 'APPROVED') OR id IN ({r_marks})""",
+                    a_ids + a_ids + r_ids,
+                )
+                approved += copied
+                rejected += cur.rowcount - copied
+    except sqlite3.IntegrityError:
+        # e.g. a shelter with the same email exists already; nothing was saved
+        return jsonify(error="Aprobarea ar dubla un adăpost existent (email). Nu s-a salvat nimic."), 409
+
+    if approved:
+        invalidate_shelters_cache()
+    return jsonify(approved=approved, rejected=rejected)
 
 
 @app.route("/admin/shelters")
 def admin_shelters():
-    guard = require_admin()
-    if guard:
-        return guard
-
     conn = get_db()
     cur = conn.cursor()
-    cur.execute("SELECT * FROM shelters ORDER BY id DESC")
-    shelters = [dict(r) for r in cur.fetchall()]
-    conn.close()
+    shelters, next_before = _admin_page(cur, SQL_LIST_SHELTERS, SQL_LIST_SHELTERS_BEFORE)
 
-    return render_template("admin_shelters.html", shelters=shelters)
+    return _stream_page("admin_shelters.html", shelters=shelters, next_before=next_before)
 
 
 @app.route("/admin/shelters/<int:shelter_id>")
 def admin_shelter_detail(shelter_id: int):
-    guard = require_admin()
-    if guard:
-        return guard
-
     conn = get_db()
     cur = conn.cursor()
-    cur.execute("SELECT * FROM shelters WHERE id=?", (shelter_id,))
+    cur.execute(SQL_GET_SHELTER, (shelter_id,))
     sh = cur.fetchone()
-    conn.close()
     if not sh:
         abort(404)
-    return render_template("admin_shelter_detail.html", shelter=dict(sh))
+    return render_template("admin_shelter_detail.html", shelter=sh)
 
 
 @app.route("/admin/shelters/<int:shelter_id>/delete", methods=["POST"])
 def admin_shelter_delete(shelter_id: int):
-    guard = require_admin()
-    if guard:
-        return guard
-
     conn = get_db()
     cur = conn.cursor()
-    cur.execute("DELETE FROM shelters WHERE id=?", (shelter_id,))
-    conn.commit()
-    conn.close()
+    # The DELETE cascades to the shelter's animals; note their photos first
+    # so the files don't stay behind in the uploads folder
+    with db_transaction(conn):
+        cur.execute("SELECT photo_filename FROM animals WHERE shelter_id = ?", (shelter_id,))
+        photos = [r["photo_filename"] for r in cur.fetchall() if r["photo_filename"]]
+        cur.execute("DELETE FROM shelters WHERE id=?", (shelter_id,))
+    invalidate_shelters_cache()
+
+    for photo_filename in photos:
+        with contextlib.suppress(OSError):
+            os.remove(os.path.join(UPLOAD_FOLDER, photo_filename))
 
     flash("Adăpost șters.", "success")
-    return redirect(url_for("admin_shelters"))
+    return redirect(cached_url_for("admin_shelters"))
 
 
 if __name__ == "__main__":
@@ -1,4 +1,8 @@
+import os
 import sqlite3
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 from werkzeug.security import generate_password_hash
 
@@ -7,10 +11,72 @@ DB_PATH = Path(__file__).with_name("petrescue.db")
 ADMIN_USERNAME = "admin"   # <- username-ul adminului
 NEW_PASSWORD = "admin123"  # <- parola noua
 
+# aceeasi metoda de hash ca in app.py (ex. "scrypt" sau "pbkdf2:sha256:200000")
+PASSWORD_HASH_METHOD = os.environ.get("PASSWORD_HASH_METHOD", "scrypt")
+
+def read_batch(path):
+    # o linie = "username,parola"; liniile goale si cele cu # sunt ignorate
+    pairs = []
+    with open(path, encoding="utf-8") as f:
+        for lineno, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            username, sep, password = line.partition(",")
+            if not sep or not username.strip() or not password:
+                raise ValueError(f"Linia {lineno} nu are formatul username,parola")
+            pairs.append((username.strip(), password))
+    return pairs
+
+def main_batch(path):
+    pairs = read_batch(path)
+    if not pairs:
+        print(f"❌ Nu exista nicio linie username,parola in {path}")
+        return
+
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        cur = conn.cursor()
+
+        usernames = [u for u, _ in pairs]
+        cur.execute(
+            f"SELECT username FROM admins WHERE username IN ({','.join('?' * len(usernames))})",
+            usernames,
+        )
+        existing = {r[0] for r in cur.fetchall()}
+        for u in usernames:
+            if u not in existing:
+                print(f"❌ Nu exista admin cu username='{u}'")
+        pairs = [(u, p) for u, p in pairs if u in existing]
+        if not pairs:
+            return
+
+        # hash-urile sunt partea lenta; le calculam in paralel pe toate nucleele
+        with ProcessPoolExecutor() as ex:
+            hashes = list(ex.map(partial(generate_password_hash, method=PASSWORD_HASH_METHOD), [p for _, p in pairs]))
+
+        # un singur UPDATE pregatit si un singur commit pentru tot fisierul
+        cur.executemany(
+            "UPDATE admins SET password_hash = ?, must_reset_password = 0 WHERE username = ?",
+            zip(hashes, [u for u, _ in pairs]),
+        )
+        conn.commit()
+
+        for u, _ in pairs:
+            print(f"✅ Parola resetata pentru username='{u}'")
+
+    finally:
+        conn.close()
+
 def main():
     if not DB_PATH.exists():
         raise FileNotFoundError(f"Nu gasesc baza de date: {DB_PATH}")
 
+    # python reset_admin_password.py parole.txt -> resetare pentru mai multi admini
+    if len(sys.argv) > 1:
+        main_batch(sys.argv[1])
+        return
+
     conn = sqlite3.connect(DB_PATH)
     try:
         cur = conn.cursor()
@@ -23,7 +89,7 @@ def main():
             return
 
         admin_id = row[0]
-        new_hash = generate_password_hash(NEW_PASSWORD)
+        new_hash = generate_password_hash(NEW_PASSWORD, method=PASSWORD_HASH_METHOD)
 
         # actualizeaza parola
         cur.execute(